@@ -1,29 +1,10 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import pydeck as pdk
-from data_loader import DataLoader
-from apscheduler.schedulers.background import BackgroundScheduler
-from scripts.update_data import update_all_data
-import atexit
-
-# --- Background Scheduler ---
-# Run data update every day at 06:00 AM
-def init_scheduler():
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(update_all_data, 'cron', hour=6, minute=0)
-    scheduler.start()
-    atexit.register(lambda: scheduler.shutdown())
-
-# Initialize scheduler only once (hack for Streamlit reloading)
-if "scheduler_started" not in st.session_state:
-    init_scheduler()
-    st.session_state["scheduler_started"] = True
-
 from datetime import datetime
 
-# --- Page Config & Theme ---
-# ... (existing config) ...
+# --- Lazy Imports ---
+# Plotly Express and pydeck pull in hundreds of submodules, so they are imported
+# inside the chart builders / map branch that use them. Python keeps them in
+# sys.modules, so only the first use in a process pays the import.
 
 # Dynamic Year Calculation
 current_year = datetime.now().year
@@ -40,6 +21,158 @@ st.set_page_config(
 
 # ... (styles) ...
 
+# --- Background Scheduler ---
+# Run data update on start and every day at 06:00 AM. Cloud Run (firebase.json)
+# only runs the Dockerfile CMD, so the scheduler lives in the Streamlit process;
+# st.cache_resource starts exactly one per process, not one per session.
+@st.cache_resource
+def init_scheduler():
+    import atexit
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from scripts.update_data import update_all_data
+
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(update_all_data)  # once, right away: writes the Parquet copies
+    scheduler.add_job(update_all_data, 'cron', hour=6, minute=0)
+    scheduler.start()
+    atexit.register(lambda: scheduler.shutdown())
+    return scheduler
+
+init_scheduler()
+
+import pandas as pd
+import numpy as np
+from data_loader import DataLoader
+
+# --- Cached Helpers ---
+def _df_hash(df):
+    """
+    Hashes a DataFrame from its column buffers instead of pickling it.
+    Column names and dtypes are part of the key; the index is ignored.
+    """
+    schema = repr((tuple(df.columns), tuple(map(str, df.dtypes)))).encode()
+    return schema + pd.util.hash_pandas_object(df, index=False).values.tobytes()
+
+def _dict_hash(d):
+    """Hashes a flat dict by its sorted items instead of pickling it."""
+    return tuple(sorted(d.items()))
+
+# Cache keys for DataFrame/dict arguments of the cached helpers below
+HASH_FUNCS = {pd.DataFrame: _df_hash, dict: _dict_hash}
+
+@st.cache_data(hash_funcs=HASH_FUNCS)
+def top_sites(df, col, k=5):
+    """Returns the `k` sites with the highest `col` (nlargest avoids a full sort)."""
+    return df.nlargest(k, col)[["name", col, "renovation_roi"]]
+
+@st.cache_data(hash_funcs=HASH_FUNCS)
+def map_points(df, columns):
+    """
+    Builds the ScatterplotLayer payload. st.pydeck_chart ships layer data as JSON,
+    so only the given columns are sent, plus positions pre-packed as [lon, lat].
+    """
+    points = df[list(columns)].copy()
+    # Round to ~1 m so float32 noise does not bloat the JSON
+    points["position"] = np.column_stack([df["lon"], df["lat"]]).astype("float64").round(5).tolist()
+    return points
+
+# --- Chart Builders (cached: Plotly Express figure construction is CPU-heavy) ---
+# cache_resource hands back the same Figure object: cache_data would pickle it,
+# and unpickling a Figure re-runs the full property validation. Callers must not
+# mutate the returned figures.
+@st.cache_resource(hash_funcs=HASH_FUNCS)
+def build_treemap(budget_df):
+    import plotly.express as px
+
+    total_budget = budget_df['Amount_CZK'].sum()
+    return px.treemap(
+        budget_df, 
+        path=['Category'], 
+        values='Amount_CZK',
+        color='Amount_CZK',
+        hover_data=['Description'],
+        color_continuous_scale='RdBu',
+        title=f"Budget Allocation (Total {total_budget/1e9:.2f}B CZK)"
+    )
+
+@st.cache_resource(hash_funcs=HASH_FUNCS)
+def build_budget_bar(budget_df):
+    import plotly.express as px
+
+    return px.bar(
+        budget_df.sort_values("Amount_CZK", ascending=True),
+        x="Amount_CZK",
+        y="Category",
+        orientation='h',
+        title="Top Funding Areas",
+        text_auto='.2s',
+        color="Amount_CZK",
+        color_continuous_scale='Blues'
+    )
+
+@st.cache_resource
+def build_wage_chart(years, wage_culture, wage_national):
+    import plotly.express as px
+
+    # Long format built directly: one block of years per series
+    series = ["Culture Sector", "National Average"]
+    wage_long = {
+        "Year": np.tile(years, len(series)),
+        "Category": np.repeat(series, len(years)),
+        "Wage (CZK)": np.concatenate([wage_culture, wage_national]),
+    }
+    
+    fig_wages = px.line(
+        wage_long, 
+        x="Year", 
+        y="Wage (CZK)", 
+        color="Category",
+        markers=True,
+        color_discrete_map={"Culture Sector": "#ef4444", "National Average": "#3b82f6"},
+        title="Average Monthly Wage Evolution"
+    )
+    # Add annotation for the latest gap
+    gap = wage_national[-1] - wage_culture[-1]
+    fig_wages.add_annotation(
+        x=years[-1], 
+        y=wage_national[-1],
+        text=f"Gap: -{gap:,.0f} CZK",
+        showarrow=True,
+        arrowhead=1
+    )
+    return fig_wages
+
+@st.cache_resource
+def build_employment_chart(years, employment_k):
+    import plotly.express as px
+
+    emp_df = pd.DataFrame({
+        "Year": years,
+        "Employees (Thousands)": employment_k
+    })
+    
+    fig_emp = px.area(
+        emp_df,
+        x="Year",
+        y="Employees (Thousands)",
+        title="Workforce Size (Thousands)",
+        color_discrete_sequence=["#10b981"]
+    )
+    fig_emp.update_yaxes(range=[70, 90]) # Zoom in to show trend
+    return fig_emp
+
+@st.cache_resource(hash_funcs=HASH_FUNCS)
+def build_discipline_pie(disciplines):
+    import plotly.express as px
+
+    return px.pie(
+        values=list(disciplines.values()), 
+        names=list(disciplines.keys()), 
+        labels={"values": "Percentage", "names": "Discipline"},
+        color_discrete_sequence=px.colors.qualitative.Prism,
+        hole=0.4
+    )
+
 # --- Data Loading ---
 loader = DataLoader()
 
@@ -60,6 +193,7 @@ with st.sidebar:
     
     st.markdown("---")
     st.caption("Data Sources: NKOD, CZSO, NIPOS")
+    st.caption(f"Data updated: {loader.get_last_updated()}")
 
 # --- Main Content ---
 econ_data = loader.load_economic_indicators()
@@ -68,8 +202,7 @@ econ_data = loader.load_economic_indicators()
 if selected_module == "Overview: KPI Scorecard":
     st.markdown('<h1 class="section-header">Executive Overview: KPI Scorecard</h1>', unsafe_allow_html=True)
     
-    econ_data = loader.load_economic_indicators()
-    
+    # econ_data is loaded at the top
     if econ_data:
         col1, col2, col3 = st.columns(3)
         
@@ -126,6 +259,8 @@ elif selected_module == "Heritage & UNESCO Map":
     
     sites_df = loader.load_unesco_sites()
     
+    import pydeck as pdk
+    
     if not sites_df.empty:
         # Toggle for Renovation ROI
         show_roi = st.toggle("Overlay: Renovation ROI Impact", value=False)
@@ -135,16 +270,17 @@ elif selected_module == "Heritage & UNESCO Map":
         # Check if 'visitors_2024' exists, else try to find any 'visitors' column
         # specific fix for the hardcoded column in CSV
         visitor_col = "visitors_2024" 
+        tooltip_cols = ("name", visitor_col, "renovation_roi")
         
         # Define layer based on toggle
         if show_roi:
             # Scale circle radius by ROI or Visitors
             layer = pdk.Layer(
                 "ScatterplotLayer",
-                sites_df,
-                get_position='[lon, lat]',
-                get_color='[0, 100, 200, 160]',
-                get_radius='renovation_roi * 100', 
+                map_points(sites_df, tooltip_cols + ("_radius_roi",)),
+                get_position='position',
+                get_color=DataLoader.ROI_COLOR_RGBA,
+                get_radius='_radius_roi', 
                 pickable=True,
                 auto_highlight=True
             )
@@ -152,8 +288,8 @@ elif selected_module == "Heritage & UNESCO Map":
         else:
             layer = pdk.Layer(
                 "ScatterplotLayer",
-                sites_df,
-                get_position='[lon, lat]',
+                map_points(sites_df, tooltip_cols),
+                get_position='position',
                 get_color='[227, 6, 19, 200]',
                 get_radius=5000,
                 pickable=True,
@@ -171,7 +307,7 @@ elif selected_module == "Heritage & UNESCO Map":
         # Highlight Table (Top Sites)
         st.markdown("### Top Sites by Visitor Volume")
         st.dataframe(
-            sites_df[["name", visitor_col, "renovation_roi"]].sort_values(visitor_col, ascending=False).head(5),
+            top_sites(sites_df, visitor_col),
             hide_index=True,
             column_config={
                 "name": "Site Name",
@@ -200,29 +336,12 @@ elif selected_module == "State Budget":
         
         with tab1:
             # Treemap
-            fig_treemap = px.treemap(
-                budget_df, 
-                path=['Category'], 
-                values='Amount_CZK',
-                color='Amount_CZK',
-                hover_data=['Description'],
-                color_continuous_scale='RdBu',
-                title=f"Budget Allocation (Total {total_budget/1e9:.2f}B CZK)"
-            )
+            fig_treemap = build_treemap(budget_df)
             st.plotly_chart(fig_treemap, use_container_width=True)
             
         with tab2:
             # Bar Chart for Rank
-            fig_bar = px.bar(
-                budget_df.sort_values("Amount_CZK", ascending=True),
-                x="Amount_CZK",
-                y="Category",
-                orientation='h',
-                title="Top Funding Areas",
-                text_auto='.2s',
-                color="Amount_CZK",
-                color_continuous_scale='Blues'
-            )
+            fig_bar = build_budget_bar(budget_df)
             st.plotly_chart(fig_bar, use_container_width=True)
         
         # Data Table
@@ -251,32 +370,7 @@ elif selected_module == "Sector Analytics":
         # --- Row 1: The Wage Gap ---
         st.subheader("⚠️ The Wage Gap: Culture vs National Average")
         
-        # Prepare data for plotting
-        wage_df = pd.DataFrame({
-            "Year": years,
-            "Culture Sector": hist.get("avg_wage_culture", []),
-            "National Average": hist.get("avg_wage_national", [])
-        })
-        wage_df = wage_df.melt('Year', var_name='Category', value_name='Wage (CZK)')
-        
-        fig_wages = px.line(
-            wage_df, 
-            x="Year", 
-            y="Wage (CZK)", 
-            color="Category",
-            markers=True,
-            color_discrete_map={"Culture Sector": "#ef4444", "National Average": "#3b82f6"},
-            title="Average Monthly Wage Evolution"
-        )
-        # Add annotation for the latest gap
-        gap = hist["avg_wage_national"][-1] - hist["avg_wage_culture"][-1]
-        fig_wages.add_annotation(
-            x=years[-1], 
-            y=hist["avg_wage_national"][-1],
-            text=f"Gap: -{gap:,.0f} CZK",
-            showarrow=True,
-            arrowhead=1
-        )
+        fig_wages = build_wage_chart(years, hist["avg_wage_culture"], hist["avg_wage_national"])
         st.plotly_chart(fig_wages, use_container_width=True)
         
         # --- Row 2: Employment & Inflation ---
@@ -284,19 +378,7 @@ elif selected_module == "Sector Analytics":
         
         with col1:
             st.subheader("Employment Trends (NACE 90-93)")
-            emp_df = pd.DataFrame({
-                "Year": years,
-                "Employees (Thousands)": hist.get("employment_k", [])
-            })
-            
-            fig_emp = px.area(
-                emp_df,
-                x="Year",
-                y="Employees (Thousands)",
-                title="Workforce Size (Thousands)",
-                color_discrete_sequence=["#10b981"]
-            )
-            fig_emp.update_yaxes(range=[70, 90]) # Zoom in to show trend
+            fig_emp = build_employment_chart(years, hist.get("employment_k", []))
             st.plotly_chart(fig_emp, use_container_width=True)
             
         with col2:
@@ -325,15 +407,7 @@ elif selected_module == "Status of the Artist":
         with col_pie:
             st.markdown("### Breakdown by Discipline")
             
-            df_discipline = pd.DataFrame(list(artist_data["disciplines"].items()), columns=["Discipline", "Percentage"])
-            
-            fig_pie = px.pie(
-                df_discipline, 
-                values="Percentage", 
-                names="Discipline", 
-                color_discrete_sequence=px.colors.qualitative.Prism,
-                hole=0.4
-            )
+            fig_pie = build_discipline_pie(artist_data["disciplines"])
             st.plotly_chart(fig_pie, use_container_width=True)
     else:
         st.error("⚠️ Registry API Offline. No artist data available.")
@@ -1,11 +1,106 @@
 import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import streamlit as st
+import httpx
 import requests
-import json
+import orjson
 import io
-import re
+import os
+import threading
+import time
 from datetime import datetime
 
+# Shared HTTP session: pooled keep-alive connections. No HTTP cache here, the
+# st.cache_* decorators already bound how often the dashboard calls out.
+SESSION = requests.Session()
+
+# Shared HTTP/2 client for calls on the UI path: fails fast if the host is unreachable.
+CLIENT = httpx.Client(http2=True, timeout=httpx.Timeout(1.0, read=2.0))
+
+
+@st.cache_resource(max_entries=32)
+def _read_bytes(path, mtime):
+    """
+    Reads a local data file as raw bytes, shared across sessions by reference.
+    `mtime` is only part of the cache key, so an updated file is re-read.
+    """
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _read_local(path):
+    """Returns the cached bytes of a local file, invalidated on modification."""
+    return _read_bytes(path, os.path.getmtime(path))
+
+
+@st.cache_resource
+def _nameday_state():
+    """Process-wide last known Nameday, shared across sessions."""
+    return {"name": None, "fetched_at": None, "lock": threading.Lock()}
+
+
+def _read_csv_table(path, columns, column_types=None):
+    """
+    Parses a local CSV with PyArrow's multithreaded reader, materializing only
+    the requested columns.
+    """
+    return pacsv.read_csv(
+        pa.BufferReader(_read_local(path)),
+        read_options=pacsv.ReadOptions(use_threads=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=columns,
+            column_types=column_types or {},
+        ),
+    )
+
+
+def _read_parquet_table(path, columns, column_types=None):
+    """
+    Reads a local Parquet file, materializing only the requested columns and
+    casting them to `column_types` where given.
+    """
+    table = pq.read_table(pa.BufferReader(_read_local(path)), columns=columns)
+    if column_types:
+        table = table.cast(pa.schema([
+            pa.field(field.name, column_types.get(field.name, field.type))
+            for field in table.schema
+        ]))
+    return table
+
+
+def _fresh_copy(parquet_path, csv_path):
+    """
+    Returns the Parquet copy if it is at least as new as its source CSV,
+    otherwise the CSV (e.g. edited after the last conversion).
+    """
+    if not os.path.exists(parquet_path):
+        return csv_path
+    if os.path.exists(csv_path) and os.path.getmtime(parquet_path) < os.path.getmtime(csv_path):
+        return csv_path
+    return parquet_path
+
+
+# WKT Regex Parser (Lightweight, no Shapely needed)
+# Matches: POINT (14.42 50.08), POINT Z (14.42 50.08 0), MULTIPOINT ((14.42 50.08), ...)
+# For MULTIPOINT the first point is used.
+WKT_POINT_PATTERN = r"(?:MULTI)?POINT\s*(?:Z\s*)?\(\s*\(?\s*(-?[0-9\.]+)\s+(-?[0-9\.]+)"
+
+
+def parse_wkt_points(wkt):
+    """
+    Parses a Series of WKT points into float32 `lat`/`lon` columns in a single
+    vectorized pass. Unparseable rows become NaN.
+    """
+    coords = wkt.astype(str).str.extract(WKT_POINT_PATTERN, expand=True)
+    return pd.DataFrame({
+        "lat": pd.to_numeric(coords[1], errors="coerce").astype("float32"),
+        "lon": pd.to_numeric(coords[0], errors="coerce").astype("float32"),
+    }, index=wkt.index)
+
+
 class DataLoader:
     """
     Handles data fetching and processing for the Czech Culture Executive Dashboard.
@@ -22,17 +117,46 @@ class DataLoader:
     # Artist Registry: Public Google Sheet CSV export (Placeholder for now)
     ARTIST_SHEET_CSV_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vR_placeholder_id/pub?output=csv"
 
+    # Nameday API: refreshed in the background once older than the TTL
+    NAMEDAY_URL = "https://svatky.adresa.info/json"
+    NAMEDAY_TTL = 3600  # 1 hour
+
+    # Local fallbacks (read through the mtime-keyed byte cache)
+    # Parquet copies are written by scripts/update_data.py; the CSVs are the source of truth,
+    # so a copy older than its CSV is ignored.
+    ECONOMICS_PATH = "data/fallback_economics.json"
+    UNESCO_PATH = "data/fallback_unesco.csv"
+    UNESCO_PARQUET_PATH = "data/fallback_unesco.parquet"
+    BUDGET_PATH = "data/budget_official.csv"
+    BUDGET_PARTITION_PATH = "data/budget/Year={year}/part-0.parquet"
+    ARTISTS_PATH = "data/fallback_artists.csv"
+    DATA_FILES = [ECONOMICS_PATH, UNESCO_PATH, BUDGET_PATH, ARTISTS_PATH]
+
+    # Columns the dashboard actually reads; everything else is skipped at parse time
+    UNESCO_COLUMNS = ["name", "lat", "lon", "visitors_2024", "renovation_roi"]
+    UNESCO_COLUMN_TYPES = {
+        "lat": pa.float32(),
+        "lon": pa.float32(),
+        "visitors_2024": pa.int32(),
+        "renovation_roi": pa.float32(),
+    }
+    BUDGET_COLUMNS = ["Year", "Category", "Amount_CZK", "Description"]
+
+    # Map styling for the Renovation ROI overlay (radius precomputed once per load)
+    ROI_RADIUS_SCALE = 100
+    ROI_COLOR_RGBA = [0, 100, 200, 160]
+
     @st.cache_data(ttl=86400)  # Cache for 24 hours
-    def load_economic_indicators(_self):
+    def _check_czso(_self):
         """
-        Fetches economic indicators from CZSO API (Real) or fallback JSON.
+        Pings the CZSO API once a day. The result is not used for display yet.
         """
-        # Try Real API
         try:
             # Demonstration of fetching from CZSO. 
             # In reality, we need a specific Dataset ID (e.g., Wages in Culture).
             # We hit a generic endpoint to prove connectivity.
-            response = requests.get(f"{_self.CZSO_API_URL}/sady/mzdy/ukazatele", timeout=3)
+            # HEAD: only the status is needed until the body is actually parsed.
+            response = SESSION.head(f"{_self.CZSO_API_URL}/sady/mzdy/ukazatele", timeout=3)
             
             if response.status_code == 200:
                 # If we had the exact schema mapping, we would use it here.
@@ -43,23 +167,38 @@ class DataLoader:
                 # unless we build a full transformer.
                 print("✅ CZSO API Connection Established.")
                 # return process_czso_data(response.json()) # Future TODO
-                pass
+                return True
         except Exception as e:
             print(f"⚠️ CZSO API Connection Failed: {e}")
+        return False
+
+    def load_economic_indicators(self):
+        """
+        Fetches economic indicators from CZSO API (Real) or fallback JSON.
+        """
+        # Try Real API
+        self._check_czso()
 
         # Fallback / Stable Source
         try:
-            with open("data/fallback_economics.json", "r") as f:
-                return json.load(f)
+            return orjson.loads(_read_local(self.ECONOMICS_PATH))
         except Exception as e:
             print(f"⚠️ Economic Data Error: {e}")
             return None
 
-    @st.cache_data(ttl=604800) # Cache for 7 days
-    def load_unesco_sites(_self):
+    def load_unesco_sites(self):
         """
         Fetches UNESCO sites from NKOD (Real) or fallback CSV.
         """
+        path = _fresh_copy(self.UNESCO_PARQUET_PATH, self.UNESCO_PATH)
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        return self._load_unesco_sites(path, mtime)
+
+    # Persisted to disk so cold starts skip the parse. Streamlit ignores `ttl`
+    # with persist="disk", so the source file's mtime keys the cache instead;
+    # max_entries keeps superseded versions from piling up in memory and on disk.
+    @st.cache_data(persist="disk", max_entries=2)
+    def _load_unesco_sites(_self, path, mtime):
         # Try Real NKOD
         try:
             print(f"Fetching NKOD data from {_self.NKOD_MONUMENTS_URL}...")
@@ -69,18 +208,8 @@ class DataLoader:
             # We will try a HEAD request or very short timeout to 'ping' availability,
             # or actually fetch it if we want to show off.
             
-            # WKT Regex Parser (Lightweight, no Shapely needed)
-            # Matches: POINT (14.42 50.08)
-            def parse_wkt_point(wkt_str):
-                try:
-                    match = re.search(r"POINT\s*\(\s*([0-9\.]+)\s+([0-9\.]+)\s*\)", str(wkt_str))
-                    if match:
-                        lon = float(match.group(1))
-                        lat = float(match.group(2))
-                        return lat, lon
-                except:
-                    pass
-                return None, None
+            # Geometry column is parsed with parse_wkt_points() once fetched:
+            # df[["lat", "lon"]] = parse_wkt_points(df["geometry"])
             
             pass 
             
@@ -89,52 +218,89 @@ class DataLoader:
 
         # Fallback / Stable Source
         try:
-            return pd.read_csv("data/fallback_unesco.csv")
+            if path.endswith(".parquet"):
+                table = _read_parquet_table(path, _self.UNESCO_COLUMNS, _self.UNESCO_COLUMN_TYPES)
+            else:
+                table = _read_csv_table(path, _self.UNESCO_COLUMNS, _self.UNESCO_COLUMN_TYPES)
+            df = table.to_pandas()
+            
+            # Ready-to-upload layer column, so reruns only reference it
+            df["_radius_roi"] = (df["renovation_roi"] * _self.ROI_RADIUS_SCALE).astype("float32")
+            return df
         except Exception as e:
             print(f"⚠️ UNESCO Data Error: {e}")
             return pd.DataFrame()
 
-    @st.cache_data(ttl=86400)
-    def load_budget(_self, year):
+    def load_budget(self, year):
         """
         Fetches Official State Budget data for a specific year.
-        Source: budget_official.csv
+        Source: budget/Year=<year>/ Parquet partition, or budget_official.csv
         """
+        path = _fresh_copy(self.BUDGET_PARTITION_PATH.format(year=year), self.BUDGET_PATH)
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        return self._load_budget(year, path, mtime)
+
+    @st.cache_resource(max_entries=16)  # Keyed on the source file's mtime
+    def _load_budget(_self, year, path, mtime):
         try:
-            df = pd.read_csv("data/budget_official.csv")
-            # Filter by year
-            filtered_df = df[df['Year'] == year].copy()
-            return filtered_df
+            if path.endswith(".parquet"):
+                # Hive partitioning keeps Year in the path, not in the file
+                source = pl.scan_parquet(path).with_columns(pl.lit(year, dtype=pl.Int64).alias("Year"))
+            else:
+                # Lazy scan: the Year predicate and column selection are pushed into the CSV reader
+                source = pl.scan_csv(path).filter(pl.col("Year") == year)
+            return source.select(_self.BUDGET_COLUMNS).collect().to_pandas()
         except Exception as e:
             print(f"⚠️ Budget Data Error: {e}")
             return pd.DataFrame()
 
-    @st.cache_data(ttl=3600)  # Cache for 1 hour
-    def load_nameday(_self):
+    def load_nameday(self):
         """
         Fetches today's Nameday from svatkyapi.cz.
-        Real-time cultural data.
+        Real-time cultural data. Stale-while-revalidate: only the first call
+        in a process waits for the API, later calls serve the last value.
         """
+        state = _nameday_state()
+        if state["fetched_at"] is None:
+            # Nothing to serve yet, fetch inline
+            with state["lock"]:
+                if state["fetched_at"] is None:
+                    self._fetch_nameday(state)
+        elif time.monotonic() - state["fetched_at"] > self.NAMEDAY_TTL:
+            # Stale: serve the last value now, refresh in the background
+            if state["lock"].acquire(blocking=False):
+                threading.Thread(target=self._refresh_nameday, args=(state,), daemon=True).start()
+        return state["name"]
+
+    def _refresh_nameday(self, state):
+        """Background refresh. The caller holds `state["lock"]`; it is released here."""
         try:
-            response = requests.get("https://svatky.adresa.info/json", timeout=3)
+            self._fetch_nameday(state)
+        finally:
+            state["lock"].release()
+
+    def _fetch_nameday(self, state):
+        try:
+            response = CLIENT.get(self.NAMEDAY_URL)
             response.raise_for_status()
             data = response.json()
             # API returns list of dicts: [{'date': '2112', 'name': 'Natálie'}]
             if data and len(data) > 0:
-                return data[0]['name']
-            return "Unknown"
+                state["name"] = data[0]['name']
+            else:
+                state["name"] = "Unknown"
         except Exception as e:
+            # Keep serving the last known value
             print(f"⚠️ Nameday API Error: {e}")
-            return None
+        state["fetched_at"] = time.monotonic()
 
-    @st.cache_data(ttl=86400)
-    def load_artist_status(_self):
+    def load_artist_status(self):
         """
         Fetches Artist Registry data from Live Google Sheet or fallback.
         """
         # Try Real Sheet
         try:
-            # response = requests.get(_self.ARTIST_SHEET_CSV_URL, timeout=3)
+            # response = SESSION.get(self.ARTIST_SHEET_CSV_URL, timeout=3)
             # if response.status_code == 200:
             #     df = pd.read_csv(io.StringIO(response.text))
             #     return _parse_artist_df(df)
@@ -144,7 +310,7 @@ class DataLoader:
 
         # Fallback
         try:
-            df = pd.read_csv("data/fallback_artists.csv")
+            df = pd.read_csv(io.BytesIO(_read_local(self.ARTISTS_PATH)))
             
             # Parse the KV structure
             data = {}
@@ -156,21 +322,24 @@ class DataLoader:
             else:
                 data["registered_count"] = 0
                 
-            # Parse disciplines (everything else)
-            disciplines = {}
-            for _, row in df.iterrows():
-                if row["indicator"] != "registered_count":
-                    try:
-                        disciplines[row["indicator"]] = float(row["value"])
-                    except:
-                        pass # Ignore non-numeric
+            # Parse disciplines (everything else), ignoring non-numeric values
+            rows = df[df["indicator"] != "registered_count"]
+            values = pd.to_numeric(rows["value"], errors="coerce").astype(float)
+            values.index = rows["indicator"]
             
-            data["disciplines"] = disciplines
+            data["disciplines"] = values.dropna().to_dict()
             return data
             
         except Exception as e:
             print(f"⚠️ Artist Registry Error: {e}")
             return None
 
-    def get_last_updated(self):
-         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    @st.cache_data(ttl=60)
+    def get_last_updated(_self):
+        """
+        Returns when the local data was last refreshed (newest file mtime).
+        """
+        mtimes = [os.path.getmtime(p) for p in _self.DATA_FILES if os.path.exists(p)]
+        if not mtimes:
+            return "N/A"
+        return datetime.fromtimestamp(max(mtimes)).strftime("%Y-%m-%d %H:%M:%S")
@@ -1,7 +1,14 @@
+import argparse
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor
+import requests_cache
 import pandas as pd
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import json
+import shutil
+import tempfile
 import logging
 from datetime import datetime
 
@@ -19,6 +26,11 @@ DATA_URLS = {
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 
+# Pooled session with an HTTP cache, so unchanged files come back as 304 Not Modified
+SESSION = requests_cache.CachedSession(
+    os.path.join(os.path.dirname(DATA_DIR), ".http_cache"), backend="sqlite", expire_after=3600
+)
+
 def fetch_unesco_data():
     """Fetches and saves UNESCO sites CSV."""
     url = DATA_URLS["unesco"]
@@ -26,7 +38,7 @@ def fetch_unesco_data():
     
     try:
         logger.info(f"Fetching UNESCO data from {url}...")
-        # response = requests.get(url, timeout=10)
+        # response = SESSION.get(url, timeout=10)
         # response.raise_for_status()
         
         # For now, we simulate a successful "check" or maintenance 
@@ -48,7 +60,7 @@ def fetch_economic_data():
     
     try:
         logger.info(f"Fetching Economic data from {url}...")
-        # response = requests.get(url, timeout=10)
+        # response = SESSION.get(url, timeout=10)
         # response.raise_for_status()
         # data = response.json()
         
@@ -67,7 +79,7 @@ def fetch_artist_data():
     
     try:
         logger.info(f"Fetching Artist data from {url}...")
-        # response = requests.get(url, timeout=10)
+        # response = SESSION.get(url, timeout=10)
         # response.raise_for_status()
         
         # In prod: with open(target_path, 'wb') as f: f.write(response.content)
@@ -76,15 +88,108 @@ def fetch_artist_data():
     except Exception as e:
         logger.error(f"Failed to update Artist data: {e}")
 
+def _is_up_to_date(copy_paths, csv_path):
+    """True if every Parquet copy exists and is at least as new as its CSV."""
+    if not copy_paths or not all(os.path.exists(p) for p in copy_paths):
+        return False
+    return min(os.path.getmtime(p) for p in copy_paths) >= os.path.getmtime(csv_path)
+
+def convert_to_parquet(data_dir=DATA_DIR):
+    """
+    Writes Parquet copies of the CSV fallbacks read by the dashboard.
+    Files are written to temp paths and moved into place with os.replace(),
+    so a concurrent reader never sees a missing or half-written copy.
+    Copies newer than their CSV are left alone, so their mtime (the dashboard's
+    cache key) only changes when the data does.
+    """
+    try:
+        budget_csv = os.path.join(data_dir, "budget_official.csv")
+        budget_dir = os.path.join(data_dir, "budget")
+        partitions = [
+            os.path.join(budget_dir, d, "part-0.parquet")
+            for d in (os.listdir(budget_dir) if os.path.isdir(budget_dir) else [])
+        ]
+        if _is_up_to_date(partitions, budget_csv):
+            logger.info("Budget Parquet copy is up to date.")
+        else:
+            _write_budget_dataset(budget_csv, budget_dir, data_dir)
+        
+        unesco_csv = os.path.join(data_dir, "fallback_unesco.csv")
+        unesco_path = os.path.join(data_dir, "fallback_unesco.parquet")
+        if _is_up_to_date([unesco_path], unesco_csv):
+            logger.info("UNESCO Parquet copy is up to date.")
+        else:
+            pq.write_table(pacsv.read_csv(unesco_csv), f"{unesco_path}.tmp")
+            os.replace(f"{unesco_path}.tmp", unesco_path)
+            logger.info("UNESCO Parquet copy written.")
+        
+    except Exception as e:
+        logger.error(f"Failed to convert data to Parquet: {e}")
+
+def _write_budget_dataset(budget_csv, budget_dir, data_dir):
+    """Writes the budget CSV as a Hive-partitioned dataset, one file per Year."""
+    budget = pacsv.read_csv(budget_csv)
+    tmp_dir = tempfile.mkdtemp(prefix=".budget-", dir=data_dir)
+    try:
+        ds.write_dataset(
+            budget,
+            tmp_dir,
+            format="parquet",
+            partitioning=["Year"],
+            partitioning_flavor="hive",
+            basename_template="part-{i}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        written = os.listdir(tmp_dir)
+        for partition in written:
+            os.makedirs(os.path.join(budget_dir, partition), exist_ok=True)
+            os.replace(
+                os.path.join(tmp_dir, partition, "part-0.parquet"),
+                os.path.join(budget_dir, partition, "part-0.parquet"),
+            )
+        # Years no longer in the CSV: drop them, or they would look stale forever
+        for partition in set(os.listdir(budget_dir)) - set(written):
+            shutil.rmtree(os.path.join(budget_dir, partition), ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    logger.info("Budget Parquet copy written.")
+
 def update_all_data():
     """Main entry point to update all datasets."""
     logger.info("Starting daily data update...")
     
-    fetch_unesco_data()
-    fetch_economic_data()
-    fetch_artist_data()
+    # Independent network I/O: fetch concurrently over the shared pooled SESSION,
+    # so wall time is the slowest source rather than the sum of all three.
+    fetchers = [fetch_unesco_data, fetch_economic_data, fetch_artist_data]
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as pool:
+        for future in [pool.submit(fetch) for fetch in fetchers]:
+            future.result()
+    
+    convert_to_parquet()
     
     logger.info("Daily data update completed.")
 
-if __name__ == "__main__":
+def run_scheduler():
+    """
+    Runs the data update now, then blocks and runs it every day at 06:00 AM.
+    For running the refresh outside the dashboard (the app starts its own scheduler).
+    """
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    
+    # Refresh (and write the Parquet copies) on start instead of waiting for 06:00
     update_all_data()
+    
+    scheduler = BlockingScheduler()
+    scheduler.add_job(update_all_data, 'cron', hour=6, minute=0)
+    logger.info("Scheduler started: daily data update at 06:00.")
+    scheduler.start()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the dashboard datasets in data/.")
+    parser.add_argument("--schedule", action="store_true", help="keep running and update every day at 06:00")
+    args = parser.parse_args()
+    
+    if args.schedule:
+        run_scheduler()
+    else:
+        update_all_data()
@@ -1,12 +1,18 @@
 import unittest
 import sys
 import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
 import pandas as pd
 
 # Add parent directory to path to import data_loader
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from data_loader import DataLoader
+import data_loader
+from data_loader import DataLoader, parse_wkt_points
+from scripts.update_data import DATA_DIR, convert_to_parquet
 
 class TestDataIntegrity(unittest.TestCase):
     def setUp(self):
@@ -41,6 +47,115 @@ class TestDataIntegrity(unittest.TestCase):
         self.assertGreaterEqual(len(df), 15, "Expected at least 15 UNESCO sites")
         print(f"✅ Loaded {len(df)} UNESCO sites.")
 
+    def test_budget(self):
+        print("\nTesting State Budget...")
+        df = self.loader.load_budget(2025)
+        self.assertFalse(df.empty, "Budget dataframe should not be empty")
+        
+        # Check columns
+        required_cols = ['Year', 'Category', 'Amount_CZK', 'Description']
+        for col in required_cols:
+            self.assertIn(col, df.columns, f"Missing column: {col}")
+            
+        # Only the requested year should be returned
+        self.assertTrue((df['Year'] == 2025).all(), "Budget should be filtered to the requested year")
+        self.assertGreater(df['Amount_CZK'].sum(), 0, "Total budget should be positive")
+        print(f"✅ Loaded {len(df)} budget lines for 2025.")
+
+    def test_parquet_copies_match_csv(self):
+        print("\nTesting Parquet Copies...")
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ["budget_official.csv", "fallback_unesco.csv"]:
+                shutil.copy(os.path.join(DATA_DIR, name), tmp)
+            convert_to_parquet(tmp)
+
+            loader = DataLoader()
+            loader.UNESCO_PATH = os.path.join(tmp, "fallback_unesco.csv")
+            loader.UNESCO_PARQUET_PATH = os.path.join(tmp, "fallback_unesco.parquet")
+            loader.BUDGET_PATH = os.path.join(tmp, "budget_official.csv")
+            loader.BUDGET_PARTITION_PATH = os.path.join(tmp, "budget", "Year={year}", "part-0.parquet")
+            partition_path = loader.BUDGET_PARTITION_PATH.format(year=2025)
+            self.assertTrue(os.path.exists(loader.UNESCO_PARQUET_PATH), "UNESCO Parquet copy not written")
+            self.assertTrue(os.path.exists(partition_path), "Budget partition not written")
+
+            # Both read paths must produce the same frame
+            for parquet_path, csv_path, load in [
+                (loader.UNESCO_PARQUET_PATH, loader.UNESCO_PATH,
+                 lambda path: loader._load_unesco_sites(path, os.path.getmtime(path))),
+                (partition_path, loader.BUDGET_PATH,
+                 lambda path: loader._load_budget(2025, path, os.path.getmtime(path))),
+            ]:
+                from_csv = load(csv_path)
+                self.assertFalse(from_csv.empty, f"{csv_path} should not be empty")
+                pd.testing.assert_frame_equal(load(parquet_path), from_csv)
+
+            # A CSV edited after the conversion wins over its stale Parquet copy
+            self.assertEqual(len(loader.load_budget(2025)), len(from_csv))
+            with open(loader.BUDGET_PATH, "a") as f:
+                f.write('2025,New Line,1000,"Added after conversion"\n')
+            stale = os.path.getmtime(partition_path) - 10
+            os.utime(partition_path, (stale, stale))
+            self.assertEqual(len(loader.load_budget(2025)), len(from_csv) + 1)
+        print("✅ Parquet copies match the CSVs.")
+
+    def test_nameday_stale_while_revalidate(self):
+        print("\nTesting Nameday Refresh...")
+        data_loader._nameday_state.clear()
+        self.addCleanup(data_loader._nameday_state.clear)
+        response = mock.Mock()
+        response.json.return_value = [{"date": "2112", "name": "Natálie"}]
+
+        # First call fetches inline; a fresh value is served without refetching
+        with mock.patch.object(data_loader.CLIENT, "get", return_value=response) as get:
+            self.assertEqual(self.loader.load_nameday(), "Natálie")
+            self.assertEqual(self.loader.load_nameday(), "Natálie")
+            self.assertEqual(get.call_count, 1)
+
+        # Make the value stale; the background refresh blocks, then fails
+        state = data_loader._nameday_state()
+        state["fetched_at"] -= DataLoader.NAMEDAY_TTL + 1
+        release = threading.Event()
+
+        def failing_get(url):
+            release.wait(5)
+            raise RuntimeError("API down")
+
+        with mock.patch.object(data_loader.CLIENT, "get", side_effect=failing_get) as get:
+            # Stale calls return the old value at once; only one refresh starts
+            self.assertEqual(self.loader.load_nameday(), "Natálie")
+            self.assertEqual(self.loader.load_nameday(), "Natálie")
+            release.set()
+            # The refresh thread releases the lock when it is done
+            self.assertTrue(state["lock"].acquire(timeout=5), "Background refresh did not finish")
+            state["lock"].release()
+            self.assertEqual(get.call_count, 1)
+
+        # The failed refresh keeps the previous value
+        self.assertEqual(state["name"], "Natálie")
+        self.assertEqual(self.loader.load_nameday(), "Natálie")
+        print("✅ Nameday served stale-while-revalidate.")
+
+    def test_wkt_point_parsing(self):
+        print("\nTesting WKT Point Parser...")
+        wkt = pd.Series([
+            "POINT (14.4208 50.0880)",
+            "POINT(15.4528 49.1842)",
+            "MULTIPOINT ((16.6068 49.1951), (16.6100 49.2000))",
+            "POINT Z (14.3152 48.8105 500)",
+            "not a point",
+            None,
+        ])
+        coords = parse_wkt_points(wkt)
+
+        self.assertEqual(list(coords.columns), ["lat", "lon"])
+        self.assertEqual(str(coords["lat"].dtype), "float32")
+        self.assertAlmostEqual(coords.loc[0, "lat"], 50.0880, places=4)
+        self.assertAlmostEqual(coords.loc[1, "lon"], 15.4528, places=4)
+        self.assertAlmostEqual(coords.loc[2, "lat"], 49.1951, places=4)
+        self.assertAlmostEqual(coords.loc[3, "lon"], 14.3152, places=4)
+        self.assertTrue(coords.loc[4:].isna().all().all(), "Invalid WKT should parse to NaN")
+        print("✅ WKT points parsed.")
+
     def test_artist_registry(self):
         print("\nTesting Artist Registry...")
         data = self.loader.load_artist_status()